@@ -0,0 +1,7 @@
+# scf_converter/constants/__init__.py
+
+# Leading text of the audit/summary line appended to every SCF output file
+AUDIT_RECORD_PREFIX = "99SUMMARY"
+
+# Trailer text after AUDIT_RECORD_PREFIX; placeholders are filled with str.format
+DEFAULT_TRAILER_LAYOUT = "RowsProcessed={rows_processed},LinesWritten={lines_written},RowsSkipped={rows_skipped}"
@@ -0,0 +1,180 @@
+# scf_converter/control_totals.py
+
+import json
+import os
+from dataclasses import dataclass, field
+from decimal import Context, Decimal, InvalidOperation, MAX_EMAX, MAX_PREC, MIN_EMIN
+from typing import Any, Dict, Iterable, List
+from scf_converter.constants import AUDIT_RECORD_PREFIX
+from scf_converter.utils.error_handling import ConfigError, FormatError
+
+# Sums must never round, however many records are added
+_EXACT_CONTEXT = Context(prec=MAX_PREC, Emax=MAX_EMAX, Emin=MIN_EMIN, traps=[InvalidOperation])
+
+@dataclass
+class ControlTotals:
+    """
+    Control totals of one conversion, accumulated one SCF line at a time.
+
+    Besides the row/line counters, 'sums' holds exact Decimal totals and 'hash_totals'
+    the hash totals of key fields (e.g. SSN): each value's digits are read as one integer
+    ('123-45-6789' -> 123456789) and those integers are summed. Both are keyed by record type
+    then field name. Totals from separately converted chunks are combined with 'merge'.
+    """
+    rows_processed: int = 0
+    lines_written: int = 0
+    rows_skipped: int = 0
+    record_counts: Dict[str, int] = field(default_factory=dict)
+    sums: Dict[str, Dict[str, Decimal]] = field(default_factory=dict)
+    hash_totals: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+    def seed(self, record_type: str, sum_fields: List[str], hash_fields: List[str]):
+        """
+        Registers zero totals so every configured placeholder exists even without records.
+        """
+        self.record_counts.setdefault(record_type, 0)
+        for field_name in sum_fields:
+            self.sums.setdefault(record_type, {}).setdefault(field_name, Decimal(0))
+        for field_name in hash_fields:
+            self.hash_totals.setdefault(record_type, {}).setdefault(field_name, 0)
+
+    def add_record(self, record_type: str, sum_values: Dict[str, str], hash_values: Dict[str, str]):
+        """
+        Adds one SCF line. Raises FormatError, leaving the totals untouched, if a value can't be totalled.
+        """
+        amounts = {}
+        for field_name, raw_value in sum_values.items():
+            value = raw_value.strip()
+            try:
+                amount = Decimal(value) if value else Decimal(0)
+            except InvalidOperation:
+                raise FormatError(f"Cannot total non-numeric value '{value}' in field '{field_name}'")
+            if not amount.is_finite():
+                raise FormatError(f"Cannot total non-finite value '{value}' in field '{field_name}'")
+            amounts[field_name] = amount
+
+        self.record_counts[record_type] = self.record_counts.get(record_type, 0) + 1
+
+        if amounts:
+            type_sums = self.sums.setdefault(record_type, {})
+            for field_name, amount in amounts.items():
+                type_sums[field_name] = _EXACT_CONTEXT.add(type_sums.get(field_name, Decimal(0)), amount)
+
+        if hash_values:
+            type_hashes = self.hash_totals.setdefault(record_type, {})
+            for field_name, raw_value in hash_values.items():
+                digits = "".join(ch for ch in raw_value if ch.isdigit())
+                type_hashes[field_name] = type_hashes.get(field_name, 0) + int(digits or 0)
+
+    def merge(self, other: "ControlTotals"):
+        """
+        Folds another chunk's totals into this one.
+        """
+        self.rows_processed += other.rows_processed
+        self.lines_written += other.lines_written
+        self.rows_skipped += other.rows_skipped
+        for record_type, count in other.record_counts.items():
+            self.record_counts[record_type] = self.record_counts.get(record_type, 0) + count
+        for record_type, type_sums in other.sums.items():
+            own_sums = self.sums.setdefault(record_type, {})
+            for field_name, amount in type_sums.items():
+                own_sums[field_name] = _EXACT_CONTEXT.add(own_sums.get(field_name, Decimal(0)), amount)
+        for record_type, type_hashes in other.hash_totals.items():
+            own_hashes = self.hash_totals.setdefault(record_type, {})
+            for field_name, total in type_hashes.items():
+                own_hashes[field_name] = own_hashes.get(field_name, 0) + total
+
+    def trailer_values(self) -> Dict[str, Any]:
+        """
+        Flat placeholders for the trailer layout: rows_processed, lines_written, rows_skipped,
+        count_<type>, sum_<type>_<field>, hash_<type>_<field>, plus sum_<field> / hash_<field>
+        across all record types.
+        """
+        values: Dict[str, Any] = {
+            "rows_processed": self.rows_processed,
+            "lines_written": self.lines_written,
+            "rows_skipped": self.rows_skipped,
+        }
+        for record_type, count in self.record_counts.items():
+            values[f"count_{record_type}"] = count
+        for record_type, type_sums in self.sums.items():
+            for field_name, amount in type_sums.items():
+                values[f"sum_{record_type}_{field_name}"] = amount
+                values[f"sum_{field_name}"] = _EXACT_CONTEXT.add(values.get(f"sum_{field_name}", Decimal(0)), amount)
+        for record_type, type_hashes in self.hash_totals.items():
+            for field_name, total in type_hashes.items():
+                values[f"hash_{record_type}_{field_name}"] = total
+                values[f"hash_{field_name}"] = values.get(f"hash_{field_name}", 0) + total
+        return values
+
+    def format_trailer(self, layout: str) -> str:
+        """
+        Builds the full audit line: AUDIT_RECORD_PREFIX followed by 'layout' filled from trailer_values.
+        """
+        try:
+            return f"{AUDIT_RECORD_PREFIX} {layout.format(**self.trailer_values())}"
+        except (KeyError, IndexError, ValueError, AttributeError, TypeError) as e:
+            raise ConfigError(f"Invalid trailer layout '{layout}': {e}")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        JSON-ready form; Decimals are written as strings so no precision is lost.
+        """
+        return {
+            "rows_processed": self.rows_processed,
+            "lines_written": self.lines_written,
+            "rows_skipped": self.rows_skipped,
+            "record_counts": dict(self.record_counts),
+            "sums": {
+                record_type: {field_name: str(amount) for field_name, amount in type_sums.items()}
+                for record_type, type_sums in self.sums.items()
+            },
+            "hash_totals": {
+                record_type: dict(type_hashes) for record_type, type_hashes in self.hash_totals.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ControlTotals":
+        """
+        Rebuilds totals from 'to_dict' output (e.g. a chunk's manifest) for merging.
+        """
+        return cls(
+            rows_processed=int(data.get("rows_processed", 0)),
+            lines_written=int(data.get("lines_written", 0)),
+            rows_skipped=int(data.get("rows_skipped", 0)),
+            record_counts=dict(data.get("record_counts", {})),
+            sums={
+                record_type: {field_name: Decimal(amount) for field_name, amount in type_sums.items()}
+                for record_type, type_sums in data.get("sums", {}).items()
+            },
+            hash_totals={
+                record_type: {field_name: int(total) for field_name, total in type_hashes.items()}
+                for record_type, type_hashes in data.get("hash_totals", {}).items()
+            },
+        )
+
+def manifest_path_for(output_path: str) -> str:
+    return os.path.splitext(output_path)[0] + ".manifest.json"
+
+def write_manifest(manifest_path: str, totals: ControlTotals, output_file: str):
+    manifest = {"output_file": output_file, **totals.to_dict()}
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+def load_manifest(manifest_path: str) -> ControlTotals:
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return ControlTotals.from_dict(json.load(f))
+    except (json.JSONDecodeError, FileNotFoundError) as e:
+        raise ConfigError(f"Error reading manifest '{manifest_path}': {e}")
+
+def merge_manifests(manifest_paths: Iterable[str]) -> ControlTotals:
+    """
+    Combines the manifests of separately converted chunks into the totals of the whole file.
+    Use 'format_trailer' / 'write_manifest' on the result for the combined trailer and manifest.
+    """
+    merged = ControlTotals()
+    for manifest_path in manifest_paths:
+        merged.merge(load_manifest(manifest_path))
+    return merged
@@ -1,12 +1,15 @@
 # scf_converter/converter.py
 
-import csv
 import os
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+from scf_converter.constants import DEFAULT_TRAILER_LAYOUT
+from scf_converter.control_totals import ControlTotals, manifest_path_for, write_manifest
 from scf_converter.converter_config import load_user_config, UserConfig
+from scf_converter.input_readers import create_input_reader
 from scf_converter.record_spec.scf_spec_loader import load_scf_specs
+from scf_converter.scf_sort import ExternalSorter
 from scf_converter.utils.logger import get_logger, log_call
-from scf_converter.utils.error_handling import FormatError
+from scf_converter.utils.error_handling import ConfigError, FormatError
 from scf_converter.utils.formatter import format_field_value
 
 logger = get_logger(__name__)
@@ -20,11 +23,30 @@ class SCFConverter:
         self.user_config: UserConfig = load_user_config(config_path)
         self.record_specs = load_scf_specs()
         self.output_file_name = self._determine_output_filename(config_path)
+        self.input_reader = create_input_reader(self.user_config.input)
+        self._sort_slices = self._build_sort_slices()
 
-        # Audit counters
-        self.lines_written = 0
-        self.rows_processed = 0
-        self.rows_skipped = 0
+        # Audit counters and control totals
+        self.control_totals = ControlTotals()
+        self._totals_slices = self._build_totals_slices()
+        self._trailer_layout = (
+            self.user_config.control_totals.trailer_layout
+            if self.user_config.control_totals else DEFAULT_TRAILER_LAYOUT
+        )
+        # Fail fast on a bad layout rather than after the whole file is converted
+        self.control_totals.format_trailer(self._trailer_layout)
+
+    @property
+    def rows_processed(self) -> int:
+        return self.control_totals.rows_processed
+
+    @property
+    def lines_written(self) -> int:
+        return self.control_totals.lines_written
+
+    @property
+    def rows_skipped(self) -> int:
+        return self.control_totals.rows_skipped
 
     def _determine_output_filename(self, config_path: str) -> str:
         """
@@ -37,37 +59,144 @@ class SCFConverter:
             base_name = os.path.splitext(os.path.basename(config_path))[0]
             return f"{base_name}.txt"
 
+    def _build_sort_slices(self) -> Optional[Dict[str, List[Optional[Tuple[int, int]]]]]:
+        """
+        For each record type, the (start, stop) offsets of every sort key in the SCF line.
+        None marks the 'record_type' pseudo-key.
+        """
+        sort_config = self.user_config.sort
+        if not sort_config:
+            return None
+
+        slices_by_type = {}
+        for key_name in sort_config.keys:
+            if key_name == "record_type":
+                continue
+            if not any(spec.get_field(key_name) for spec in self.record_specs.values()):
+                raise ConfigError(f"Sort key '{key_name}' is not a field of any SCF record spec")
+
+        for record_type, spec in self.record_specs.items():
+            key_slices = []
+            for key_name in sort_config.keys:
+                if key_name == "record_type":
+                    key_slices.append(None)
+                    continue
+                field_def = spec.get_field(key_name)
+                # Record types without the field sort as if it were blank
+                key_slices.append((field_def.start, field_def.end + 1) if field_def else (0, 0))
+            slices_by_type[record_type] = key_slices
+        return slices_by_type
+
+    def _sort_key(self, record_type: str, scf_line: str) -> Tuple[str, ...]:
+        return tuple(
+            record_type if key_slice is None else scf_line[key_slice[0]:key_slice[1]]
+            for key_slice in self._sort_slices[record_type]
+        )
+
+    def _build_totals_slices(self) -> Dict[str, Tuple[List[Tuple[str, int, int]], List[Tuple[str, int, int]]]]:
+        """
+        For each mapped record type, the (field, start, stop) offsets to sum and to hash-total.
+        """
+        totals_config = self.user_config.control_totals
+        sum_fields = totals_config.sum_fields if totals_config else []
+        hash_fields = totals_config.hash_fields if totals_config else []
+
+        for field_name in sum_fields + hash_fields:
+            if not any(spec.get_field(field_name) for spec in self.record_specs.values()):
+                raise ConfigError(f"Control total field '{field_name}' is not a field of any SCF record spec")
+
+        for field_name in sum_fields:
+            for spec in self.record_specs.values():
+                field_def = spec.get_field(field_name)
+                if field_def and not (field_def.formatter.startswith("decimal-") or field_def.formatter == "integer"):
+                    raise ConfigError(
+                        f"Sum field '{field_name}' of record type '{spec.record_type}' is not numeric "
+                        f"(formatter '{field_def.formatter}')"
+                    )
+
+        slices_by_type = {}
+        for record_type in self.user_config.record_mappings:
+            spec = self.record_specs.get(record_type)
+            if not spec:
+                continue
+            type_slices = []
+            for field_names in (sum_fields, hash_fields):
+                field_defs = [spec.get_field(name) for name in field_names]
+                type_slices.append([(f.name, f.start, f.end + 1) for f in field_defs if f])
+            sum_slices, hash_slices = type_slices
+            self.control_totals.seed(
+                record_type, [name for name, _, _ in sum_slices], [name for name, _, _ in hash_slices]
+            )
+            slices_by_type[record_type] = (sum_slices, hash_slices)
+        return slices_by_type
+
+    def _accumulate_totals(self, record_type: str, scf_line: str):
+        """
+        Adds the line to the control totals. Sum fields are numeric-formatted (checked at init),
+        so a FormatError here means the totals can't be trusted and the conversion fails.
+        """
+        sum_slices, hash_slices = self._totals_slices.get(record_type, ([], []))
+        self.control_totals.add_record(
+            record_type,
+            {name: scf_line[start:stop] for name, start, stop in sum_slices},
+            {name: scf_line[start:stop] for name, start, stop in hash_slices}
+        )
+
+    def _create_sorter(self) -> Optional[ExternalSorter]:
+        sort_config = self.user_config.sort
+        if not sort_config:
+            return None
+        return ExternalSorter(
+            self._sort_key,
+            max_memory_bytes=sort_config.max_memory_mb * 1024 * 1024,
+            temp_dir=sort_config.temp_dir
+        )
+
     @log_call(logger)
-    def convert(self, input_csv_path: str, output_folder: Optional[str] = None) -> str:
+    def convert(self, input_path: str, output_folder: Optional[str] = None) -> str:
         """
-        Main method to convert a CSV into an SCF text file.
+        Main method to convert an input file (CSV, delimited text, Excel or fixed-width,
+        per the 'input' config section) into an SCF text file.
         """
         if output_folder is None:
-            output_folder = os.path.dirname(input_csv_path)
+            output_folder = os.path.dirname(input_path)
 
         output_path = os.path.join(output_folder, self.output_file_name)
-        logger.info(f"Starting conversion: CSV='{input_csv_path}' -> SCF='{output_path}'")
+        logger.info(f"Starting conversion: {self.user_config.input.type}='{input_path}' -> SCF='{output_path}'")
 
-        with open(input_csv_path, "r", encoding="utf-8-sig", newline="") as csv_file:
-            reader = csv.DictReader(csv_file)
+        # With a sort configured, lines go to sorted runs on disk and are merged at the end
+        sorter = self._create_sorter()
+        try:
             with open(output_path, "w", encoding="utf-8") as scf_out:
-                for row in reader:
-                    self.rows_processed += 1
+                for row in self.input_reader.iter_rows(input_path):
+                    self.control_totals.rows_processed += 1
                     records_written_for_row = 0
 
                     for record_type, record_mapping in self.user_config.record_mappings.items():
                         scf_line = self._create_scf_line(row, record_type, record_mapping)
                         if scf_line:
-                            scf_out.write(scf_line + "\n")
-                            self.lines_written += 1
+                            self._accumulate_totals(record_type, scf_line)
+                            if sorter:
+                                sorter.add(record_type, scf_line)
+                            else:
+                                scf_out.write(scf_line + "\n")
+                            self.control_totals.lines_written += 1
                             records_written_for_row += 1
 
                     if records_written_for_row == 0:
-                        # Means no SCF lines were written for this CSV row
-                        self.rows_skipped += 1
+                        # Means no SCF lines were written for this input row
+                        self.control_totals.rows_skipped += 1
+
+                if sorter:
+                    sorter.write_sorted(scf_out)
+        finally:
+            if sorter:
+                sorter.cleanup()
 
-        # Write an optional audit record or summary
+        # Write an optional audit record or summary (always after the sorted lines)
         self._write_audit_record(output_path)
+        if self.user_config.control_totals and self.user_config.control_totals.write_manifest:
+            self._write_manifest(output_path)
 
         logger.info(f"Finished conversion. Rows processed={self.rows_processed}, lines={self.lines_written}")
         return output_path
@@ -84,7 +213,7 @@ class SCFConverter:
 
         line_parts = []
         for field_def in spec.fields:
-            length = field_def.end - field_def.start + 1
+            length = field_def.length
 
             # Retrieve mapping info
             field_map = record_mapping.fields.get(field_def.name)
@@ -115,10 +244,18 @@ class SCFConverter:
         """
         Optional final line summarizing results, e.g. record type '99'.
         """
-        audit_line = f"99SUMMARY RowsProcessed={self.rows_processed},LinesWritten={self.lines_written},RowsSkipped={self.rows_skipped}"
+        audit_line = self.control_totals.format_trailer(self._trailer_layout)
         with open(output_path, "a", encoding="utf-8") as f:
             f.write(audit_line + "\n")
 
+    def _write_manifest(self, output_path: str):
+        """
+        JSON control totals next to the output, so reconciliation needn't re-read the SCF file.
+        """
+        manifest_path = manifest_path_for(output_path)
+        write_manifest(manifest_path, self.control_totals, os.path.basename(output_path))
+        logger.info(f"Control totals manifest written: {manifest_path}")
+
 @log_call(logger)
 def csv_to_scf_convert(input_csv: str, config_path: str, output_folder: Optional[str] = None) -> str:
     """
@@ -2,7 +2,8 @@
 
 import json
 from dataclasses import dataclass, field
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any
+from scf_converter.constants import DEFAULT_TRAILER_LAYOUT
 from scf_converter.utils.error_handling import ConfigError
 
 @dataclass
@@ -13,11 +14,56 @@ class FieldMapping:
 @dataclass
 class RecordMapping:
     fields: Dict[str, FieldMapping] = field(default_factory=dict)
+    # Spec fields that identify a record of this type (used when diffing SCF runs)
+    key_fields: List[str] = field(default_factory=list)
+
+@dataclass
+class SortConfig:
+    # Spec field names, or "record_type", compared in order
+    keys: List[str] = field(default_factory=list)
+    max_memory_mb: int = 256
+    temp_dir: Optional[str] = None
+
+@dataclass
+class ColumnSpec:
+    name: str
+    start: int
+    end: int
+
+@dataclass
+class InputConfig:
+    # One of: csv, text, excel, fixed_width
+    type: str = "csv"
+    encoding: str = "utf-8-sig"
+    # csv / text
+    dialect: Optional[str] = None
+    delimiter: Optional[str] = None
+    quotechar: Optional[str] = None
+    # excel
+    sheet_name: Optional[str] = None
+    header_row: int = 1
+    date_format: str = "%m/%d/%Y"
+    # fixed_width
+    columns: List[ColumnSpec] = field(default_factory=list)
+    skip_lines: int = 0
+
+@dataclass
+class ControlTotalsConfig:
+    # Spec fields summed exactly per record type (e.g. salary)
+    sum_fields: List[str] = field(default_factory=list)
+    # Spec fields hash-totalled (e.g. ssn): each value's digits read as one integer, then summed
+    hash_fields: List[str] = field(default_factory=list)
+    # Text after the '99SUMMARY ' prefix of the trailer, see ControlTotals.trailer_values
+    trailer_layout: str = DEFAULT_TRAILER_LAYOUT
+    write_manifest: bool = True
 
 @dataclass
 class UserConfig:
     output_file_name: Optional[str] = None
     record_mappings: Dict[str, RecordMapping] = field(default_factory=dict)
+    sort: Optional[SortConfig] = None
+    input: InputConfig = field(default_factory=InputConfig)
+    control_totals: Optional[ControlTotalsConfig] = None
 
 def load_user_config(filepath: str) -> UserConfig:
     """
@@ -44,9 +90,66 @@ def _parse_user_config(data: dict[str, Any]) -> UserConfig:
                 csv_column=user_fields.get(field_name),
                 default_value=user_defaults.get(field_name)
             )
-        record_mappings[record_type] = RecordMapping(fields=fields_map)
+        record_mappings[record_type] = RecordMapping(
+            fields=fields_map,
+            key_fields=list(rec_data.get("key_fields", []))
+        )
 
     return UserConfig(
         output_file_name=data.get("output_file_name"),
-        record_mappings=record_mappings
+        record_mappings=record_mappings,
+        sort=_parse_sort_config(data.get("sort")),
+        input=_parse_input_config(data.get("input", {})),
+        control_totals=_parse_control_totals_config(data.get("control_totals"))
+    )
+
+def _parse_control_totals_config(totals_data: Optional[dict[str, Any]]) -> Optional[ControlTotalsConfig]:
+    if not totals_data:
+        return None
+
+    return ControlTotalsConfig(
+        sum_fields=list(totals_data.get("sum_fields", [])),
+        hash_fields=list(totals_data.get("hash_fields", [])),
+        trailer_layout=totals_data.get("trailer_layout", DEFAULT_TRAILER_LAYOUT),
+        write_manifest=bool(totals_data.get("write_manifest", True))
+    )
+
+def _parse_input_config(input_data: dict[str, Any]) -> InputConfig:
+    columns = []
+    for col in input_data.get("columns", []):
+        try:
+            columns.append(ColumnSpec(name=col["name"], start=col["start"], end=col["end"]))
+        except KeyError as e:
+            raise ConfigError(f"Input column definition {col} is missing {e}")
+
+    defaults = InputConfig()
+    return InputConfig(
+        type=input_data.get("type", defaults.type).lower(),
+        encoding=input_data.get("encoding", defaults.encoding),
+        dialect=input_data.get("dialect"),
+        delimiter=input_data.get("delimiter"),
+        quotechar=input_data.get("quotechar"),
+        sheet_name=input_data.get("sheet_name"),
+        header_row=input_data.get("header_row", defaults.header_row),
+        date_format=input_data.get("date_format", defaults.date_format),
+        columns=columns,
+        skip_lines=input_data.get("skip_lines", defaults.skip_lines)
+    )
+
+def _parse_sort_config(sort_data: Optional[dict[str, Any]]) -> Optional[SortConfig]:
+    if not sort_data:
+        return None
+
+    keys = sort_data.get("keys", [])
+    if not keys:
+        raise ConfigError("'sort' section requires a non-empty 'keys' list")
+
+    max_memory_mb = sort_data.get("max_memory_mb", SortConfig.max_memory_mb)
+    if isinstance(max_memory_mb, bool) or not isinstance(max_memory_mb, int) or max_memory_mb <= 0:
+        raise ConfigError(f"'sort.max_memory_mb' must be a positive integer, got {max_memory_mb!r}")
+
+    return SortConfig(
+        keys=list(keys),
+        max_memory_mb=max_memory_mb,
+        temp_dir=sort_data.get("temp_dir")
     )
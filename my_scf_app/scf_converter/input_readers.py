@@ -0,0 +1,150 @@
+# scf_converter/input_readers.py
+
+import abc
+import csv
+import datetime
+import io
+from typing import Any, Dict, Iterator, Type
+from scf_converter.converter_config import InputConfig
+from scf_converter.utils.error_handling import ConfigError, CSVError
+
+class InputReader(abc.ABC):
+    """
+    Base class for streaming input sources. 'iter_rows' yields one dict of
+    column name -> string value per source row without loading the whole file.
+    Configuration problems are raised by the constructor, before any output is opened.
+    """
+
+    def __init__(self, input_config: InputConfig):
+        self.input_config = input_config
+
+    @abc.abstractmethod
+    def iter_rows(self, input_path: str) -> Iterator[Dict[str, str]]:
+        pass
+
+class CSVInputReader(InputReader):
+    default_delimiter = ","
+
+    def __init__(self, input_config: InputConfig):
+        super().__init__(input_config)
+        # Let the csv module validate dialect/delimiter/quotechar once, up front
+        try:
+            csv.reader(io.StringIO(), **self._reader_options())
+        except (csv.Error, TypeError) as e:
+            raise ConfigError(f"Invalid '{input_config.type}' input options: {e}")
+
+    def _reader_options(self) -> Dict[str, Any]:
+        cfg = self.input_config
+        options: Dict[str, Any] = {}
+        if cfg.dialect:
+            options["dialect"] = cfg.dialect
+        if cfg.delimiter:
+            options["delimiter"] = cfg.delimiter
+        elif not cfg.dialect:
+            options["delimiter"] = self.default_delimiter
+        if cfg.quotechar:
+            options["quotechar"] = cfg.quotechar
+        return options
+
+    def iter_rows(self, input_path: str) -> Iterator[Dict[str, str]]:
+        with open(input_path, "r", encoding=self.input_config.encoding, newline="") as input_file:
+            try:
+                yield from csv.DictReader(input_file, **self._reader_options())
+            except csv.Error as e:
+                raise CSVError(f"Error reading '{input_path}': {e}")
+
+class DelimitedTextInputReader(CSVInputReader):
+    """
+    Plain delimited text (e.g. pipe-delimited) with a header line and no quoting.
+    """
+    default_delimiter = "|"
+
+    def _reader_options(self) -> Dict[str, Any]:
+        options = super()._reader_options()
+        if not self.input_config.quotechar:
+            options["quoting"] = csv.QUOTE_NONE
+        return options
+
+class ExcelInputReader(InputReader):
+    """
+    Streams an .xlsx sheet through openpyxl's read-only mode.
+    """
+
+    def __init__(self, input_config: InputConfig):
+        super().__init__(input_config)
+        try:
+            import openpyxl
+        except ImportError:
+            raise ConfigError("Input type 'excel' requires the 'openpyxl' package")
+        self._openpyxl = openpyxl
+
+    def iter_rows(self, input_path: str) -> Iterator[Dict[str, str]]:
+        cfg = self.input_config
+        workbook = self._openpyxl.load_workbook(input_path, read_only=True, data_only=True)
+        try:
+            if cfg.sheet_name:
+                if cfg.sheet_name not in workbook.sheetnames:
+                    raise CSVError(f"Sheet '{cfg.sheet_name}' not found in '{input_path}'")
+                sheet = workbook[cfg.sheet_name]
+            else:
+                sheet = workbook.active
+
+            header = None
+            for row in sheet.iter_rows(min_row=cfg.header_row, values_only=True):
+                if header is None:
+                    header = [self._cell_to_str(cell).strip() for cell in row]
+                    continue
+                if all(cell is None for cell in row):
+                    continue
+                yield dict(zip(header, (self._cell_to_str(cell) for cell in row)))
+        finally:
+            workbook.close()
+
+    def _cell_to_str(self, value: Any) -> str:
+        if value is None:
+            return ""
+        if isinstance(value, (datetime.datetime, datetime.date)):
+            return value.strftime(self.input_config.date_format)
+        if isinstance(value, float) and value.is_integer():
+            # Excel stores whole numbers as floats
+            return str(int(value))
+        return str(value)
+
+class FixedWidthInputReader(InputReader):
+    """
+    Slices each line into the configured columns (0-based, inclusive offsets).
+    """
+
+    def __init__(self, input_config: InputConfig):
+        super().__init__(input_config)
+        if not input_config.columns:
+            raise ConfigError("Input type 'fixed_width' requires 'columns'")
+
+    def iter_rows(self, input_path: str) -> Iterator[Dict[str, str]]:
+        cfg = self.input_config
+        with open(input_path, "r", encoding=cfg.encoding, newline="") as input_file:
+            for line_no, line in enumerate(input_file, start=1):
+                if line_no <= cfg.skip_lines:
+                    continue
+                line = line.rstrip("\r\n")
+                if not line.strip():
+                    continue
+                yield {col.name: line[col.start:col.end + 1].strip() for col in cfg.columns}
+
+INPUT_READERS: Dict[str, Type[InputReader]] = {
+    "csv": CSVInputReader,
+    "text": DelimitedTextInputReader,
+    "excel": ExcelInputReader,
+    "fixed_width": FixedWidthInputReader,
+}
+
+def create_input_reader(input_config: InputConfig) -> InputReader:
+    """
+    Returns the reader registered for 'input_config.type'.
+    """
+    reader_cls = INPUT_READERS.get(input_config.type)
+    if reader_cls is None:
+        raise ConfigError(
+            f"Unsupported input type '{input_config.type}'. Expected one of: {', '.join(INPUT_READERS)}"
+        )
+    return reader_cls(input_config)
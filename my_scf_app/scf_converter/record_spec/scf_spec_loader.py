@@ -3,7 +3,7 @@
 import json
 from functools import lru_cache
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 @dataclass
 class FieldSpec:
@@ -12,11 +12,28 @@ class FieldSpec:
     end: int
     formatter: str
 
+    @property
+    def length(self) -> int:
+        return self.end - self.start + 1
+
 @dataclass
 class RecordSpec:
     record_type: str
     fields: List[FieldSpec]
 
+    @property
+    def record_length(self) -> int:
+        """
+        Length of an SCF line for this record type (fields are padded to their width).
+        """
+        return sum(field_def.length for field_def in self.fields)
+
+    def get_field(self, name: str) -> Optional[FieldSpec]:
+        for field_def in self.fields:
+            if field_def.name == name:
+                return field_def
+        return None
+
 @lru_cache(maxsize=None)
 def load_scf_specs(path: str = "scf_converter/record_spec/scf_record_spec.json") -> Dict[str, RecordSpec]:
     """
@@ -0,0 +1,266 @@
+# scf_converter/scf_diff.py
+
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+from scf_converter.constants import AUDIT_RECORD_PREFIX
+from scf_converter.converter_config import load_user_config, UserConfig
+from scf_converter.record_spec.scf_spec_loader import load_scf_specs
+from scf_converter.utils.logger import get_logger, log_call
+from scf_converter.utils.error_handling import ConfigError, FormatError
+
+logger = get_logger(__name__)
+
+# Action codes prefixed to each line of the delta file
+ACTION_ADD = "A"
+ACTION_CHANGE = "C"
+ACTION_DELETE = "D"
+
+DELTA_TRAILER_PREFIX = "99DELTA"
+
+_AUDIT_PREFIX_BYTES = AUDIT_RECORD_PREFIX.encode("utf-8")
+_KEY_SEPARATOR = "\x1f"
+# Partitions that still overflow are re-split with a new hash seed at most this many times;
+# beyond that (e.g. one key with huge numbers of duplicates) the part is indexed regardless
+MAX_PARTITION_DEPTH = 4
+
+@dataclass
+class DiffStats:
+    adds: int = 0
+    changes: int = 0
+    deletes: int = 0
+    unchanged: int = 0
+
+@dataclass
+class _KeyLayout:
+    record_type: str
+    key_slices: List[Tuple[int, int]]
+    value_slices: List[Tuple[int, int]]
+
+class _IndexOverflow(Exception):
+    """Raised internally when the in-memory key index exceeds its budget."""
+    pass
+
+class SCFDiffer:
+    def __init__(self, config_path: str, max_keys_in_memory: int = 1_000_000,
+                 num_partitions: int = 64, temp_dir: Optional[str] = None):
+        """
+        Constructor: loads user config and SCF specs, prepares the key layout per record type.
+        Records are identified by their line length, so every mapped record type must
+        have a distinct length.
+        """
+        logger.info(f"Initializing SCFDiffer with config: {config_path}")
+        self.user_config: UserConfig = load_user_config(config_path)
+        self.record_specs = load_scf_specs()
+        self.max_keys_in_memory = max_keys_in_memory
+        self.num_partitions = num_partitions
+        self.temp_dir = temp_dir
+        self._layouts: Dict[int, _KeyLayout] = self._build_layouts()
+
+    def _build_layouts(self) -> Dict[int, _KeyLayout]:
+        """
+        Maps SCF line length -> key/value slices taken from the spec offsets.
+        """
+        layouts = {}
+        for record_type, record_mapping in self.user_config.record_mappings.items():
+            spec = self.record_specs.get(record_type)
+            if not spec:
+                logger.warning(f"Record type '{record_type}' not found in specs. Skipping.")
+                continue
+
+            key_slices = []
+            for field_name in record_mapping.key_fields:
+                field_def = spec.get_field(field_name)
+                if field_def is None:
+                    raise ConfigError(f"Key field '{field_name}' is not defined for record type '{record_type}'")
+                key_slices.append((field_def.start, field_def.end + 1))
+
+            # Everything outside the key fields is hashed to detect changes
+            value_slices = []
+            pos = 0
+            for start, stop in sorted(key_slices):
+                if start > pos:
+                    value_slices.append((pos, start))
+                pos = max(pos, stop)
+            if pos < spec.record_length:
+                value_slices.append((pos, spec.record_length))
+
+            length = spec.record_length
+            if length in layouts:
+                raise ConfigError(
+                    f"Record types '{layouts[length].record_type}' and '{record_type}' share line length {length}; "
+                    f"they cannot be told apart when diffing"
+                )
+            layouts[length] = _KeyLayout(record_type, key_slices, value_slices)
+        return layouts
+
+    @log_call(logger)
+    def diff(self, old_path: str, new_path: str, delta_path: str) -> DiffStats:
+        """
+        Streams two SCF files and writes the adds/changes/deletes between them to 'delta_path'.
+        Falls back to hash-partitioning both files on disk when the keys of the old file
+        don't fit in 'max_keys_in_memory'; partitions that still don't fit are split again.
+        """
+        logger.info(f"Starting diff: old='{old_path}', new='{new_path}' -> delta='{delta_path}'")
+        stats = DiffStats()
+
+        with open(delta_path, "w", encoding="utf-8") as delta_out:
+            try:
+                self._diff_pair(old_path, new_path, delta_out, stats, limit=self.max_keys_in_memory)
+            except _IndexOverflow:
+                logger.info(
+                    f"More than {self.max_keys_in_memory} keys in '{old_path}'; "
+                    f"partitioning into {self.num_partitions} buckets"
+                )
+                with tempfile.TemporaryDirectory(prefix="scf_diff_", dir=self.temp_dir) as part_dir:
+                    self._diff_partitioned(old_path, new_path, part_dir, delta_out, stats, depth=0)
+
+            delta_out.write(
+                f"{DELTA_TRAILER_PREFIX} Adds={stats.adds},Changes={stats.changes},"
+                f"Deletes={stats.deletes},Unchanged={stats.unchanged}\n"
+            )
+
+        logger.info(f"Finished diff. adds={stats.adds}, changes={stats.changes}, deletes={stats.deletes}")
+        return stats
+
+    def _diff_partitioned(self, old_path: str, new_path: str, part_dir: str, delta_out,
+                          stats: DiffStats, depth: int):
+        """
+        Splits both files into partitions and diffs each pair within the key budget,
+        re-partitioning (with a different hash seed) any pair whose old part still overflows.
+        """
+        level_dir = tempfile.mkdtemp(prefix=f"level{depth}_", dir=part_dir)
+        old_parts = self._partition(old_path, level_dir, "old", seed=depth)
+        new_parts = self._partition(new_path, level_dir, "new", seed=depth)
+        for old_part, new_part in zip(old_parts, new_parts):
+            if depth + 1 >= MAX_PARTITION_DEPTH:
+                logger.warning(
+                    f"Partition '{old_part}' still exceeds {self.max_keys_in_memory} keys after "
+                    f"{MAX_PARTITION_DEPTH} splits; indexing it in memory"
+                )
+                self._diff_pair(old_part, new_part, delta_out, stats, limit=None)
+            else:
+                try:
+                    self._diff_pair(old_part, new_part, delta_out, stats, limit=self.max_keys_in_memory)
+                except _IndexOverflow:
+                    self._diff_partitioned(old_part, new_part, level_dir, delta_out, stats, depth + 1)
+            # Free the disk space as we go
+            os.remove(old_part)
+            os.remove(new_part)
+
+    def _partition(self, path: str, part_dir: str, prefix: str, seed: int) -> List[str]:
+        """
+        Splits an SCF file into 'num_partitions' files by a seeded hash of the record key,
+        so matching records of both runs land in the same partition number.
+        """
+        salt = seed.to_bytes(hashlib.blake2b.SALT_SIZE, "big")
+        part_paths = [os.path.join(part_dir, f"{prefix}_{i:04d}.scf") for i in range(self.num_partitions)]
+        handles = [open(p, "wb") for p in part_paths]
+        try:
+            for _, line in self._iter_records(path):
+                key = self._record_key(line.decode("utf-8"))
+                key_hash = hashlib.blake2b(key.encode("utf-8"), digest_size=8, salt=salt).digest()
+                bucket = int.from_bytes(key_hash, "big") % self.num_partitions
+                handles[bucket].write(line + b"\n")
+        finally:
+            for handle in handles:
+                handle.close()
+        return part_paths
+
+    def _diff_pair(self, old_path: str, new_path: str, delta_out, stats: DiffStats, limit: Optional[int]):
+        """
+        Indexes 'old_path' as key -> [(digest, byte offset), ...], then streams 'new_path' against it.
+        Records sharing a key are matched by occurrence: the n-th record with a key in the new run
+        is compared with the n-th one in the old run. Only digests are held in memory; deleted
+        lines are re-read from disk by offset. Raises _IndexOverflow, before writing anything,
+        if 'old_path' holds more than 'limit' records.
+        """
+        index: Dict[str, List[Tuple[bytes, int]]] = {}
+        indexed = 0
+        for offset, line in self._iter_records(old_path):
+            key, digest = self._key_and_digest(line.decode("utf-8"))
+            index.setdefault(key, []).append((digest, offset))
+            indexed += 1
+            if limit is not None and indexed > limit:
+                raise _IndexOverflow()
+
+        # Duplicates are consumed from the end of their list, so put the first occurrence last
+        for occurrences in index.values():
+            if len(occurrences) > 1:
+                occurrences.reverse()
+
+        for _, line in self._iter_records(new_path):
+            text = line.decode("utf-8")
+            key, digest = self._key_and_digest(text)
+            occurrences = index.get(key)
+            if not occurrences:
+                self._write_delta(delta_out, ACTION_ADD, text)
+                stats.adds += 1
+                continue
+
+            old_digest, _ = occurrences.pop()
+            if not occurrences:
+                del index[key]
+            if old_digest != digest:
+                self._write_delta(delta_out, ACTION_CHANGE, text)
+                stats.changes += 1
+            else:
+                stats.unchanged += 1
+
+        # Whatever is left in the index no longer exists in the new run
+        leftover_offsets = sorted(offset for occurrences in index.values() for _, offset in occurrences)
+        with open(old_path, "rb") as old_file:
+            for offset in leftover_offsets:
+                old_file.seek(offset)
+                text = old_file.readline().rstrip(b"\r\n").decode("utf-8")
+                self._write_delta(delta_out, ACTION_DELETE, text)
+                stats.deletes += 1
+
+    def _iter_records(self, path: str) -> Iterator[Tuple[int, bytes]]:
+        """
+        Yields (byte offset, line without newline) for every data record, skipping the audit line.
+        """
+        offset = 0
+        with open(path, "rb") as f:
+            for raw_line in f:
+                line_offset = offset
+                offset += len(raw_line)
+                line = raw_line.rstrip(b"\r\n")
+                if not line or line.startswith(_AUDIT_PREFIX_BYTES):
+                    continue
+                yield line_offset, line
+
+    def _layout_for(self, line: str) -> _KeyLayout:
+        layout = self._layouts.get(len(line))
+        if layout is None:
+            raise FormatError(f"SCF line of length {len(line)} does not match any mapped record type: '{line}'")
+        return layout
+
+    def _record_key(self, line: str) -> str:
+        layout = self._layout_for(line)
+        if not layout.key_slices:
+            # No key fields configured: the whole line identifies the record
+            return layout.record_type + _KEY_SEPARATOR + line
+        parts = [layout.record_type] + [line[start:stop] for start, stop in layout.key_slices]
+        return _KEY_SEPARATOR.join(parts)
+
+    def _key_and_digest(self, line: str) -> Tuple[str, bytes]:
+        layout = self._layout_for(line)
+        remainder = "".join(line[start:stop] for start, stop in layout.value_slices)
+        digest = hashlib.blake2b(remainder.encode("utf-8"), digest_size=16).digest()
+        return self._record_key(line), digest
+
+    @staticmethod
+    def _write_delta(delta_out, action: str, line: str):
+        delta_out.write(action + line + "\n")
+
+@log_call(logger)
+def diff_scf_files(old_path: str, new_path: str, delta_path: str, config_path: str,
+                   max_keys_in_memory: int = 1_000_000, temp_dir: Optional[str] = None) -> DiffStats:
+    """
+    Convenience function that instantiates SCFDiffer and writes the delta file.
+    """
+    differ = SCFDiffer(config_path, max_keys_in_memory=max_keys_in_memory, temp_dir=temp_dir)
+    return differ.diff(old_path, new_path, delta_path)
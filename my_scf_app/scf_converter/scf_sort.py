@@ -0,0 +1,139 @@
+# scf_converter/scf_sort.py
+
+import heapq
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from operator import itemgetter
+from typing import Callable, Iterable, Iterator, List, Optional, TextIO, Tuple
+from scf_converter.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Rough per-record bookkeeping cost (buffer tuple + list slot) on top of the line and its key
+_RECORD_OVERHEAD_BYTES = 80
+# Max number of runs merged at once; more runs are merged in several passes
+DEFAULT_MAX_FAN_IN = 128
+
+SortKeyFunc = Callable[[str, str], Tuple]
+
+# Run files hold length-prefixed UTF-8 (record_type, line) pairs, so any line content is safe
+_RUN_HEADER = struct.Struct(">II")
+_buffer_key = itemgetter(0)
+
+class ExternalSorter:
+    """
+    Bounded-memory sort of (record_type, SCF line) records.
+
+    Records are buffered until 'max_memory_bytes' is reached, then sorted and spilled
+    to a run file in 'temp_dir'. The runs are combined with a k-way heap merge.
+    Equal keys keep their insertion order.
+
+    The cap is approximate: it counts the line, its precomputed sort key and a fixed
+    per-record overhead, as estimated by sys.getsizeof.
+    """
+
+    def __init__(self, key_func: SortKeyFunc, max_memory_bytes: int,
+                 temp_dir: Optional[str] = None, max_fan_in: int = DEFAULT_MAX_FAN_IN):
+        self.key_func = key_func
+        self.max_memory_bytes = max_memory_bytes
+        self.max_fan_in = max_fan_in
+        self._buffer: List[Tuple[Tuple, str, str]] = []
+        self._buffer_bytes = 0
+        self._runs: List[str] = []
+        self._runs_created = 0
+        self._run_dir = tempfile.mkdtemp(prefix="scf_sort_", dir=temp_dir)
+
+    def add(self, record_type: str, line: str):
+        # The key is computed once here, so sorting a buffer allocates nothing uncounted
+        key = self.key_func(record_type, line)
+        self._buffer.append((key, record_type, line))
+        self._buffer_bytes += (
+            sys.getsizeof(line) + sys.getsizeof(key) + sum(sys.getsizeof(part) for part in key)
+            + _RECORD_OVERHEAD_BYTES
+        )
+        if self._buffer_bytes >= self.max_memory_bytes:
+            self._spill()
+
+    def write_sorted(self, out: TextIO):
+        """
+        Writes every added line to 'out' in key order.
+        """
+        if not self._runs:
+            # Everything fit in memory, no merge needed
+            self._buffer.sort(key=_buffer_key)
+            records: Iterable[Tuple[str, str]] = ((record_type, line) for _, record_type, line in self._buffer)
+        else:
+            self._spill()
+            while len(self._runs) > self.max_fan_in:
+                self._merge_pass()
+            records = self._merge(self._runs)
+
+        for _, line in records:
+            out.write(line + "\n")
+
+        self._buffer = []
+        self._buffer_bytes = 0
+
+    def cleanup(self):
+        shutil.rmtree(self._run_dir, ignore_errors=True)
+
+    def _sort_key(self, record: Tuple[str, str]) -> Tuple:
+        return self.key_func(record[0], record[1])
+
+    def _new_run_path(self) -> str:
+        self._runs_created += 1
+        return os.path.join(self._run_dir, f"run_{self._runs_created:06d}.tmp")
+
+    def _spill(self):
+        if not self._buffer:
+            return
+        self._buffer.sort(key=_buffer_key)
+        run_path = self._new_run_path()
+        self._write_run(run_path, ((record_type, line) for _, record_type, line in self._buffer))
+        self._runs.append(run_path)
+        logger.debug(f"Spilled sorted run {run_path} ({len(self._buffer)} records)")
+        self._buffer = []
+        self._buffer_bytes = 0
+
+    def _merge_pass(self):
+        """
+        Merges groups of 'max_fan_in' runs into larger runs to bound open file handles.
+        """
+        old_runs = self._runs
+        self._runs = []
+        for i in range(0, len(old_runs), self.max_fan_in):
+            group = old_runs[i:i + self.max_fan_in]
+            run_path = self._new_run_path()
+            self._write_run(run_path, self._merge(group))
+            self._runs.append(run_path)
+            for path in group:
+                os.remove(path)
+
+    def _merge(self, run_paths: List[str]) -> Iterator[Tuple[str, str]]:
+        # heapq.merge is stable across inputs, and runs are listed in creation order
+        return heapq.merge(*(self._read_run(path) for path in run_paths), key=self._sort_key)
+
+    @staticmethod
+    def _write_run(run_path: str, records: Iterable[Tuple[str, str]]):
+        with open(run_path, "wb") as run_file:
+            for record_type, line in records:
+                type_bytes = record_type.encode("utf-8")
+                line_bytes = line.encode("utf-8")
+                run_file.write(_RUN_HEADER.pack(len(type_bytes), len(line_bytes)))
+                run_file.write(type_bytes)
+                run_file.write(line_bytes)
+
+    @staticmethod
+    def _read_run(run_path: str) -> Iterator[Tuple[str, str]]:
+        with open(run_path, "rb") as run_file:
+            while True:
+                header = run_file.read(_RUN_HEADER.size)
+                if not header:
+                    return
+                type_len, line_len = _RUN_HEADER.unpack(header)
+                record_type = run_file.read(type_len).decode("utf-8")
+                line = run_file.read(line_len).decode("utf-8")
+                yield record_type, line
@@ -43,6 +43,8 @@ def _handle_decimal(value: str, formatter: str) -> str:
     try:
         decimal_places = int(decimal_places_str)
         dec = Decimal(value)
+        if not dec.is_finite():
+            raise FormatError(f"Invalid decimal '{value}': not a finite number")
         # Quantize to specified decimal places
         dec_str = str(dec.quantize(Decimal(f'1.{"0"*decimal_places}')))
         return dec_str
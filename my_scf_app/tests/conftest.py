@@ -0,0 +1,34 @@
+# tests/conftest.py
+
+import os
+import sys
+
+import pytest
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+@pytest.fixture(autouse=True)
+def _run_from_app_dir(monkeypatch):
+    # The record spec and sample config are loaded by paths relative to my_scf_app/
+    monkeypatch.chdir(APP_DIR)
+
+@pytest.fixture
+def base_config():
+    import json
+    with open(os.path.join(APP_DIR, "scf_converter", "config", "xtmy_config.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+@pytest.fixture
+def write_config(tmp_path, base_config):
+    """
+    Writes base_config updated with the given keys to a temp JSON file and returns its path.
+    """
+    import json
+
+    def _write(**overrides):
+        path = tmp_path / "config.json"
+        path.write_text(json.dumps({**base_config, **overrides}), encoding="utf-8")
+        return str(path)
+    return _write
@@ -0,0 +1,133 @@
+# tests/test_control_totals.py
+
+import json
+import random
+from decimal import Decimal
+
+import pytest
+
+from scf_converter.control_totals import ControlTotals, manifest_path_for, merge_manifests
+from scf_converter.converter import SCFConverter
+from scf_converter.utils.error_handling import ConfigError, FormatError
+from scf_converter.utils.formatter import format_field_value
+
+LAYOUT = (
+    "RowsProcessed={rows_processed},LinesWritten={lines_written},RowsSkipped={rows_skipped},"
+    "Count03={count_03},Count07={count_07},S={sum_07_salary},H={hash_ssn}"
+)
+TOTALS = {"sum_fields": ["salary"], "hash_fields": ["ssn"], "trailer_layout": LAYOUT}
+
+def write_csv(path, rows):
+    path.write_text(
+        "SSN,DATE_b,SALARY\n" + "".join(f"{ssn},01/02/2024,{salary}\n" for ssn, salary in rows),
+        encoding="utf-8"
+    )
+    return str(path)
+
+def convert(tmp_path, config_path, input_path, name):
+    out_dir = tmp_path / name
+    out_dir.mkdir()
+    return SCFConverter(config_path).convert(input_path, str(out_dir))
+
+def random_rows(count, seed=11):
+    rng = random.Random(seed)
+    return [
+        (f"{rng.randint(100000000, 999999999)}", f"{rng.randint(0, 9999999)}.{rng.randint(0, 99):02d}")
+        for _ in range(count)
+    ]
+
+def test_totals_match_recomputation_from_output(tmp_path, write_config):
+    rows = random_rows(250)
+    config_path = write_config(output_file_name="out.txt", control_totals=TOTALS)
+
+    output_path = convert(tmp_path, config_path, write_csv(tmp_path / "in.csv", rows), "single")
+
+    lines = open(output_path, encoding="utf-8").read().splitlines()
+    salaries = [Decimal(line[9:19]) for line in lines[:-1] if len(line) == 29]
+    ssn_hash = sum(int(line[:9]) for line in lines[:-1])
+    assert lines[-1] == (
+        f"99SUMMARY RowsProcessed=250,LinesWritten=500,RowsSkipped=0,"
+        f"Count03=250,Count07=250,S={sum(salaries)},H={ssn_hash}"
+    )
+    manifest = json.load(open(manifest_path_for(output_path), encoding="utf-8"))
+    assert manifest["sums"]["07"]["salary"] == str(sum(salaries))
+    assert manifest["rows_processed"] == 250
+
+def test_merged_chunk_manifests_equal_single_pass(tmp_path, write_config):
+    rows = random_rows(300)
+    config_path = write_config(output_file_name="out.txt", control_totals=TOTALS)
+
+    single_output = convert(tmp_path, config_path, write_csv(tmp_path / "all.csv", rows), "single")
+    chunk_manifests = []
+    for i in range(4):
+        chunk_csv = write_csv(tmp_path / f"chunk{i}.csv", rows[i::4])
+        chunk_manifests.append(manifest_path_for(convert(tmp_path, config_path, chunk_csv, f"chunk{i}")))
+
+    merged = merge_manifests(chunk_manifests)
+
+    single = json.load(open(manifest_path_for(single_output), encoding="utf-8"))
+    assert merged.to_dict() == {k: v for k, v in single.items() if k != "output_file"}
+    single_trailer = open(single_output, encoding="utf-8").read().splitlines()[-1]
+    assert merged.format_trailer(LAYOUT) == single_trailer
+
+def test_sums_are_exact_beyond_default_decimal_precision():
+    totals = ControlTotals()
+    big = "9" * 40 + ".01"
+    for _ in range(3):
+        totals.add_record("07", {"salary": big}, {})
+    assert totals.sums["07"]["salary"] == Decimal("2" + "9" * 39 + "7.03")
+
+def test_non_finite_value_is_rejected_without_changing_totals():
+    totals = ControlTotals()
+    totals.add_record("07", {"salary": "1.50"}, {"ssn": "111"})
+    for bad in ("NaN", "sNaN", "Infinity", "abc"):
+        with pytest.raises(FormatError):
+            totals.add_record("07", {"salary": bad}, {"ssn": "222"})
+    assert totals.record_counts == {"07": 1}
+    assert totals.sums == {"07": {"salary": Decimal("1.50")}}
+    assert totals.hash_totals == {"07": {"ssn": 111}}
+
+@pytest.mark.parametrize("bad_salary", ["NaN", "sNaN", "Infinity", "-Inf"])
+def test_non_finite_salary_is_handled_the_same_with_and_without_totals(tmp_path, write_config, bad_salary):
+    input_path = write_csv(tmp_path / "in.csv", [("111111111", "1.00"), ("222222222", bad_salary)])
+    outputs = {}
+    for name, extra in (("plain", {}), ("totals", {"control_totals": TOTALS})):
+        config_path = write_config(output_file_name="out.txt", **extra)
+        outputs[name] = open(convert(tmp_path, config_path, input_path, name), encoding="utf-8").read().splitlines()
+
+    # The formatter rejects the value, so the 07 record is dropped whatever the config
+    assert outputs["plain"][:-1] == outputs["totals"][:-1]
+    assert len(outputs["plain"]) - 1 == 3
+    assert outputs["totals"][-1].startswith(
+        "99SUMMARY RowsProcessed=2,LinesWritten=3,RowsSkipped=0,Count03=2,Count07=1,S=1.00,"
+    )
+
+def test_formatter_rejects_non_finite_decimals():
+    for value in ("NaN", "sNaN", "Infinity"):
+        with pytest.raises(FormatError):
+            format_field_value(value, "decimal-2")
+
+def test_non_numeric_sum_field_is_rejected_at_init(tmp_path, write_config):
+    config_path = write_config(control_totals={"sum_fields": ["date"]})
+
+    with pytest.raises(ConfigError, match="not numeric"):
+        SCFConverter(config_path)
+
+@pytest.mark.parametrize("layout", ["{bogus}", "{0}", "{rows_processed.x}", "{rows_processed[0]}", "{rows_processed:zz}"])
+def test_bad_trailer_layout_is_rejected_at_init(write_config, layout):
+    with pytest.raises(ConfigError, match="Invalid trailer layout"):
+        SCFConverter(write_config(control_totals={"trailer_layout": layout}))
+
+def test_hash_total_sums_each_value_read_as_one_integer():
+    totals = ControlTotals()
+    totals.add_record("03", {}, {"ssn": "123-45-6789"})
+    totals.add_record("03", {}, {"ssn": "000000001"})
+    assert totals.hash_totals["03"]["ssn"] == 123456789 + 1
+
+def test_default_trailer_is_unchanged_without_control_totals(tmp_path, write_config):
+    config_path = write_config(output_file_name="out.txt")
+    output_path = convert(tmp_path, config_path, write_csv(tmp_path / "in.csv", [("111111111", "1")]), "plain")
+
+    assert open(output_path, encoding="utf-8").read().splitlines()[-1] == \
+        "99SUMMARY RowsProcessed=1,LinesWritten=2,RowsSkipped=0"
+    assert not (tmp_path / "plain" / "out.manifest.json").exists()
@@ -0,0 +1,113 @@
+# tests/test_input_readers.py
+
+import datetime
+import sys
+
+import pytest
+
+from scf_converter.converter import SCFConverter
+from scf_converter.converter_config import ColumnSpec, InputConfig
+from scf_converter.input_readers import (
+    CSVInputReader, DelimitedTextInputReader, ExcelInputReader, FixedWidthInputReader,
+    InputReader, create_input_reader,
+)
+from scf_converter.utils.error_handling import ConfigError
+
+EXPECTED_SCF = [
+    "11111111101/02/2024P03 ",
+    "111111111100.50    20250101  ",
+]
+
+def convert(tmp_path, write_config, input_path, input_section):
+    config_path = write_config(output_file_name="out.txt", input=input_section)
+    output_path = SCFConverter(config_path).convert(str(input_path), str(tmp_path))
+    return open(output_path, encoding="utf-8").read().splitlines()[:-1]
+
+def test_csv_reader_honours_delimiter_and_quotechar(tmp_path):
+    path = tmp_path / "in.csv"
+    path.write_text("A;B\n'x;1';2\n", encoding="utf-8")
+    reader = CSVInputReader(InputConfig(delimiter=";", quotechar="'"))
+
+    assert list(reader.iter_rows(str(path))) == [{"A": "x;1", "B": "2"}]
+
+def test_csv_reader_uses_dialect_delimiter(tmp_path):
+    path = tmp_path / "in.tsv"
+    path.write_text("A\tB\n1\t2\n", encoding="utf-8")
+    reader = CSVInputReader(InputConfig(dialect="excel-tab"))
+
+    assert list(reader.iter_rows(str(path))) == [{"A": "1", "B": "2"}]
+
+def test_delimited_text_reader_is_pipe_without_quoting(tmp_path):
+    path = tmp_path / "in.txt"
+    path.write_text('A|B\n"q"|2\n', encoding="utf-8")
+    reader = DelimitedTextInputReader(InputConfig(type="text"))
+
+    assert list(reader.iter_rows(str(path))) == [{"A": '"q"', "B": "2"}]
+
+def test_text_input_converts(tmp_path, write_config):
+    path = tmp_path / "in.txt"
+    path.write_text("SSN|DATE_b|SALARY\n111111111|01/02/2024|100.5\n", encoding="utf-8")
+
+    assert convert(tmp_path, write_config, path, {"type": "text"}) == EXPECTED_SCF
+
+def test_fixed_width_input_converts(tmp_path, write_config):
+    path = tmp_path / "in.dat"
+    path.write_text("HEADER\n11111111101/02/2024 100.5\n\n", encoding="utf-8")
+    columns = [
+        {"name": "SSN", "start": 0, "end": 8},
+        {"name": "DATE_b", "start": 9, "end": 18},
+        {"name": "SALARY", "start": 19, "end": 25},
+    ]
+
+    assert convert(tmp_path, write_config, path, {"type": "fixed_width", "skip_lines": 1, "columns": columns}) == EXPECTED_SCF
+
+def test_excel_input_converts(tmp_path, write_config):
+    openpyxl = pytest.importorskip("openpyxl")
+    path = tmp_path / "in.xlsx"
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "Data"
+    sheet.append(["SSN", "DATE_b", "SALARY"])
+    sheet.append([111111111, datetime.datetime(2024, 1, 2), 100.5])
+    sheet.append([None, None, None])
+    workbook.save(path)
+
+    assert convert(tmp_path, write_config, path, {"type": "excel", "sheet_name": "Data"}) == EXPECTED_SCF
+
+def test_excel_reader_requires_openpyxl_at_construction(monkeypatch):
+    monkeypatch.setitem(sys.modules, "openpyxl", None)
+
+    with pytest.raises(ConfigError, match="openpyxl"):
+        ExcelInputReader(InputConfig(type="excel"))
+
+def test_fixed_width_without_columns_fails_before_output_is_touched(tmp_path, write_config):
+    output_path = tmp_path / "keep.txt"
+    output_path.write_text("previous run\n", encoding="utf-8")
+    config_path = write_config(output_file_name="keep.txt", input={"type": "fixed_width"})
+
+    with pytest.raises(ConfigError, match="columns"):
+        SCFConverter(config_path)
+    assert output_path.read_text(encoding="utf-8") == "previous run\n"
+
+def test_unknown_input_type_is_rejected():
+    with pytest.raises(ConfigError, match="Unsupported input type"):
+        create_input_reader(InputConfig(type="parquet"))
+
+def test_input_reader_is_abstract():
+    with pytest.raises(TypeError):
+        InputReader(InputConfig())
+    assert isinstance(FixedWidthInputReader(InputConfig(columns=[ColumnSpec("A", 0, 1)])), InputReader)
+
+@pytest.mark.parametrize("input_section", [
+    {"delimiter": ";;"},
+    {"dialect": "nope"},
+    {"type": "text", "quotechar": "''"},
+])
+def test_bad_csv_options_fail_before_output_is_touched(tmp_path, write_config, input_section):
+    output_path = tmp_path / "keep.txt"
+    output_path.write_text("previous run\n", encoding="utf-8")
+    config_path = write_config(output_file_name="keep.txt", input=input_section)
+
+    with pytest.raises(ConfigError, match="input options"):
+        SCFConverter(config_path)
+    assert output_path.read_text(encoding="utf-8") == "previous run\n"
@@ -0,0 +1,105 @@
+# tests/test_scf_diff.py
+
+from scf_converter.scf_diff import SCFDiffer
+
+# 03: ssn(9) date(10) processing_code(4); 07: ssn(9) salary(10) date(10)
+def rec03(ssn, date="01/02/2024", code="P03"):
+    return f"{ssn:<9}{date:<10}{code:<4}"
+
+def rec07(ssn, salary="100.00", date="20250101"):
+    return f"{ssn:<9}{salary:<10}{date:<10}"
+
+def write_scf(path, lines):
+    path.write_text("".join(line + "\n" for line in lines) + "99SUMMARY RowsProcessed=0\n", encoding="utf-8")
+    return str(path)
+
+def run_diff(tmp_path, config_path, old_lines, new_lines, **kwargs):
+    old_path = write_scf(tmp_path / "old.txt", old_lines)
+    new_path = write_scf(tmp_path / "new.txt", new_lines)
+    delta_path = tmp_path / "delta.txt"
+    stats = SCFDiffer(config_path, **kwargs).diff(old_path, new_path, str(delta_path))
+    return stats, delta_path.read_text(encoding="utf-8").splitlines()
+
+def test_adds_changes_deletes(tmp_path, write_config):
+    config_path = write_config()
+    old = [rec03("111111111"), rec07("111111111"), rec03("222222222"), rec03("333333333")]
+    new = [rec03("111111111"), rec07("111111111", salary="200.00"), rec03("222222222"), rec03("444444444")]
+
+    stats, delta = run_diff(tmp_path, config_path, old, new)
+
+    assert (stats.adds, stats.changes, stats.deletes, stats.unchanged) == (1, 1, 1, 2)
+    assert delta == [
+        "C" + rec07("111111111", salary="200.00"),
+        "A" + rec03("444444444"),
+        "D" + rec03("333333333"),
+        "99DELTA Adds=1,Changes=1,Deletes=1,Unchanged=2",
+    ]
+
+def test_partitioned_diff_matches_in_memory(tmp_path, write_config):
+    config_path = write_config()
+    old = [rec03(f"{i:09d}", code=f"P{i % 7}") for i in range(500)]
+    new = [rec03(f"{i:09d}", code=f"P{i % 5}") for i in range(100, 650)]
+
+    in_memory, in_memory_delta = run_diff(tmp_path, config_path, old, new)
+    partitioned, partitioned_delta = run_diff(
+        tmp_path, config_path, old, new, max_keys_in_memory=10, num_partitions=7
+    )
+
+    assert partitioned == in_memory
+    assert sorted(partitioned_delta) == sorted(in_memory_delta)
+
+def test_duplicate_keys_are_matched_by_occurrence(tmp_path, write_config):
+    config_path = write_config()
+    old = [rec03("111223333", code="AAAA"), rec03("111223333", code="BBBB")]
+    new = [rec03("111223333", code="AAAA")]
+
+    for kwargs in ({}, {"max_keys_in_memory": 1, "num_partitions": 3}):
+        stats, delta = run_diff(tmp_path, config_path, old, new, **kwargs)
+        assert (stats.adds, stats.changes, stats.deletes, stats.unchanged) == (0, 0, 1, 1)
+        assert delta[:-1] == ["D" + rec03("111223333", code="BBBB")]
+
+def test_duplicate_key_in_new_run_is_an_add(tmp_path, write_config):
+    config_path = write_config()
+    old = [rec03("111223333", code="AAAA")]
+    new = [rec03("111223333", code="AAAA"), rec03("111223333", code="BBBB")]
+
+    stats, delta = run_diff(tmp_path, config_path, old, new)
+
+    assert (stats.adds, stats.changes, stats.deletes, stats.unchanged) == (1, 0, 0, 1)
+    # Every record of both runs is accounted for
+    assert stats.changes + stats.unchanged + stats.deletes == len(old)
+    assert stats.adds + stats.changes + stats.unchanged == len(new)
+
+def test_overflowing_partitions_are_split_again(tmp_path, write_config, monkeypatch):
+    config_path = write_config()
+    old = [rec03(f"{i:09d}", code=f"P{i % 7}") for i in range(500)]
+    new = [rec03(f"{i:09d}", code=f"P{i % 5}") for i in range(100, 650)]
+    in_memory, in_memory_delta = run_diff(tmp_path, config_path, old, new)
+
+    unbounded_calls = []
+    original_diff_pair = SCFDiffer._diff_pair
+
+    def spy_diff_pair(self, old_path, new_path, delta_out, stats, limit):
+        if limit is None:
+            unbounded_calls.append(old_path)
+        return original_diff_pair(self, old_path, new_path, delta_out, stats, limit)
+
+    monkeypatch.setattr(SCFDiffer, "_diff_pair", spy_diff_pair)
+    # 500 keys over 4 buckets need three rounds of splitting to get under 20 per part
+    partitioned, partitioned_delta = run_diff(
+        tmp_path, config_path, old, new, max_keys_in_memory=20, num_partitions=4
+    )
+
+    assert unbounded_calls == []
+    assert partitioned == in_memory
+    assert sorted(partitioned_delta) == sorted(in_memory_delta)
+
+def test_unsplittable_duplicates_fall_back_after_max_depth(tmp_path, write_config):
+    config_path = write_config()
+    old = [rec03("111223333", code=f"{i:04d}") for i in range(3000)]
+    new = [rec03("111223333", code=f"{i:04d}") for i in range(1000, 4000)]
+
+    stats, _ = run_diff(tmp_path, config_path, old, new, max_keys_in_memory=10, num_partitions=2)
+
+    # Every key hashes to the same part, so splitting never helps; occurrences still line up 1:1
+    assert (stats.adds, stats.changes, stats.deletes, stats.unchanged) == (0, 3000, 0, 0)
@@ -0,0 +1,97 @@
+# tests/test_scf_sort.py
+
+import io
+import random
+
+import pytest
+
+from scf_converter import converter as converter_module
+from scf_converter.converter import SCFConverter
+from scf_converter.scf_sort import ExternalSorter
+from scf_converter.utils.error_handling import ConfigError
+
+def first_three(record_type, line):
+    return (line[:3],)
+
+def sort_records(records, **kwargs):
+    sorter = ExternalSorter(first_three, **kwargs)
+    try:
+        for record_type, line in records:
+            sorter.add(record_type, line)
+        spilled = len(sorter._runs)
+        out = io.StringIO()
+        sorter.write_sorted(out)
+    finally:
+        sorter.cleanup()
+    return spilled, out.getvalue()
+
+def test_spill_and_multi_pass_merge_is_sorted_and_stable():
+    rng = random.Random(7)
+    records = [("03", f"{rng.randint(0, 50):03d}-{i}") for i in range(5000)]
+
+    spilled, output = sort_records(records, max_memory_bytes=20_000, max_fan_in=3)
+
+    assert spilled > 3
+    # Python's sort is stable, so this is the expected order for equal keys too
+    assert output.splitlines() == [line for _, line in sorted(records, key=lambda r: r[1][:3])]
+
+def test_in_memory_path_matches_spill_path():
+    records = [("03", f"{i % 10:03d}-{i}") for i in range(200)]
+
+    in_memory_spilled, in_memory = sort_records(records, max_memory_bytes=10**9)
+    spilled, on_disk = sort_records(records, max_memory_bytes=2_000, max_fan_in=2)
+
+    assert in_memory_spilled == 0 and spilled > 0
+    assert on_disk == in_memory
+
+def test_embedded_newlines_and_tabs_survive_run_files():
+    records = [("03", "11\n2 tail"), ("07", "005\tx"), ("03", "003\r\nz")]
+
+    _, in_memory = sort_records(records, max_memory_bytes=10**9)
+    _, on_disk = sort_records(records, max_memory_bytes=1)
+
+    assert on_disk == in_memory == "003\r\nz\n005\tx\n11\n2 tail\n"
+
+def test_memory_cap_counts_sort_keys():
+    sorter = ExternalSorter(first_three, max_memory_bytes=10**9)
+    try:
+        sorter.add("03", "abcdef")
+        # line + key tuple + key part, not just the line
+        assert sorter._buffer_bytes > 2 * len("abcdef") + 80
+    finally:
+        sorter.cleanup()
+
+def test_converter_sorts_by_ssn_and_keeps_trailer_last(tmp_path, write_config, monkeypatch):
+    ssns = [f"{n:09d}" for n in random.Random(3).sample(range(100000000, 999999999), 300)]
+    input_path = tmp_path / "input.csv"
+    input_path.write_text(
+        "SSN,DATE_b,SALARY\n" + "".join(f"{ssn},01/02/2024,{i}\n" for i, ssn in enumerate(ssns)),
+        encoding="utf-8"
+    )
+    config_path = write_config(output_file_name="sorted.txt", sort={"keys": ["ssn", "record_type"], "max_memory_mb": 1})
+
+    # max_memory_mb can't go below 1 MB, so shrink the sorter's budget to force spills and merge passes
+    sorters = []
+
+    def small_sorter(key_func, max_memory_bytes, temp_dir=None):
+        sorter = ExternalSorter(key_func, max_memory_bytes=5_000, temp_dir=temp_dir, max_fan_in=2)
+        sorters.append(sorter)
+        return sorter
+
+    monkeypatch.setattr(converter_module, "ExternalSorter", small_sorter)
+
+    output_path = SCFConverter(config_path).convert(str(input_path), str(tmp_path))
+
+    assert len(sorters) == 1 and sorters[0]._runs_created > 4
+    lines = open(output_path, encoding="utf-8").read().splitlines()
+    assert lines[-1].startswith("99SUMMARY RowsProcessed=300,LinesWritten=600")
+    keys = [(line[:9], "03" if len(line) == 23 else "07") for line in lines[:-1]]
+    assert keys == sorted(keys)
+    assert len(keys) == 600
+
+@pytest.mark.parametrize("max_memory_mb", [True, False, 0, -1, 1.5, "64"])
+def test_invalid_max_memory_mb_is_rejected(write_config, max_memory_mb):
+    config_path = write_config(sort={"keys": ["ssn"], "max_memory_mb": max_memory_mb})
+
+    with pytest.raises(ConfigError, match="max_memory_mb"):
+        SCFConverter(config_path)